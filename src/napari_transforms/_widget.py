@@ -1,6 +1,8 @@
-from typing import TYPE_CHECKING, Optional, Tuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
 
 import numpy as np
+from qtpy.QtCore import Qt, QTimer, Signal
 from qtpy.QtWidgets import (
     QHBoxLayout,
     QLabel,
@@ -23,36 +25,51 @@ class TransformsWidget(QWidget):
         super().__init__()
         self._viewer = napari_viewer
         self._selected_layer = None
+        # Replacing a layer's data can change its ndim, so track it too.
+        self._selected_ndim = 0
 
         self._name_widget = NameWidget()
-        self._scale_widget = ScaleWidget()
-        self._translate_widget = TranslateWidget()
-        self._rotate_widget = RotateWidget()
-        self._shear_widget = ShearWidget()
-        self._affine_widget = AffineWidget()
-
-        scale = _Collapsible("scale", self._scale_widget)
-        translate = _Collapsible("translate", self._translate_widget)
-        rotate = _Collapsible("rotate", self._rotate_widget)
-        shear = _Collapsible("shear", self._shear_widget)
-        affine = _Collapsible("affine", self._affine_widget)
-        for w in (scale, translate, rotate, shear, affine):
+        # Use the same callback object for every connect/disconnect pair.
+        self._on_layer_name_changed = self._name_widget.on_layer_name_changed
+        # Transform widgets are only created when their section is first
+        # expanded, so only the commonly edited ones are built up front.
+        self._scale = _Collapsible("scale", ScaleWidget)
+        self._translate = _Collapsible("translate", TranslateWidget)
+        self._rotate = _Collapsible("rotate", RotateWidget)
+        self._shear = _Collapsible("shear", ShearWidget)
+        self._affine = _Collapsible("affine", AffineWidget)
+        self._transform_widgets: Tuple[QWidget, ...] = ()
+        for w in (
+            self._scale,
+            self._translate,
+            self._rotate,
+            self._shear,
+            self._affine,
+        ):
+            w.widgetCreated.connect(self._on_transform_widget_created)
+        for w in (self._scale, self._translate):
             w.expand(animate=False)
 
         layout = QVBoxLayout()
         layout.addWidget(self._name_widget)
-        layout.addWidget(scale)
-        layout.addWidget(translate)
-        layout.addWidget(rotate)
-        layout.addWidget(shear)
-        layout.addWidget(affine)
+        layout.addWidget(self._scale)
+        layout.addWidget(self._translate)
+        layout.addWidget(self._rotate)
+        layout.addWidget(self._shear)
+        layout.addWidget(self._affine)
         self.setLayout(layout)
 
         self._viewer.layers.selection.events.changed.connect(
             self._on_selected_layers_changed
         )
+        # Axis labels can change several times in quick succession, so
+        # only refresh them once per turn of the event loop.
+        self._axis_labels_timer = QTimer(self)
+        self._axis_labels_timer.setSingleShot(True)
+        self._axis_labels_timer.setInterval(0)
+        self._axis_labels_timer.timeout.connect(self._on_axis_labels_changed)
         self._viewer.dims.events.axis_labels.connect(
-            self._on_axis_labels_changed
+            self._on_viewer_axis_labels_changed
         )
         self._name_widget.apply_all_layers.clicked.connect(
             self._on_apply_clicked
@@ -61,60 +78,95 @@ class TransformsWidget(QWidget):
         self._on_selected_layers_changed()
 
     def _on_selected_layers_changed(self) -> None:
-        layer = None
-        if len(self._viewer.layers.selection) == 1:
-            layer = next(iter(self._viewer.layers.selection))
+        selection = self._viewer.layers.selection
+        layer = next(iter(selection)) if len(selection) == 1 else None
 
-        if layer == self._selected_layer:
+        if layer is self._selected_layer:
             return
 
         if self._selected_layer is not None:
             self._selected_layer.events.name.disconnect(
-                self._name_widget.on_layer_name_changed
+                self._on_layer_name_changed
+            )
+            self._selected_layer.events.data.disconnect(
+                self._on_layer_data_changed
             )
 
         if layer is not None:
-            layer.events.name.connect(self._name_widget.on_layer_name_changed)
-
-        self._name_widget.set_layer(layer)
-        self._scale_widget.set_layer(layer)
-        self._translate_widget.set_layer(layer)
-        self._rotate_widget.set_layer(layer)
-        self._shear_widget.set_layer(layer)
-        self._affine_widget.set_layer(layer)
-        self._selected_layer = layer
-
+            layer.events.name.connect(self._on_layer_name_changed)
+            layer.events.data.connect(self._on_layer_data_changed)
+
+        # Refresh all the child widgets before laying out and repainting.
+        self.setUpdatesEnabled(False)
+        try:
+            self._name_widget.set_layer(layer)
+            for w in self._transform_widgets:
+                w.set_layer(layer)
+            self._selected_layer = layer
+            self._selected_ndim = layer.ndim if layer is not None else 0
+
+            self._on_axis_labels_changed()
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _on_layer_data_changed(self) -> None:
+        # Only the ndim of the data affects the transforms.
+        layer = self._selected_layer
+        if layer is None or layer.ndim == self._selected_ndim:
+            return
+        self._selected_ndim = layer.ndim
+        self.setUpdatesEnabled(False)
+        try:
+            for w in self._transform_widgets:
+                w.refresh()
+            self._on_axis_labels_changed()
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _on_transform_widget_created(self, widget: QWidget) -> None:
+        self._transform_widgets += (widget,)
+        widget.set_layer(self._selected_layer)
         self._on_axis_labels_changed()
 
+    def _on_viewer_axis_labels_changed(self) -> None:
+        self._axis_labels_timer.start()
+
     def _on_axis_labels_changed(self) -> None:
         layer = self._selected_layer
         if layer is None:
             return
         layer_axes = self._viewer.dims.axis_labels[-layer.ndim :]
-        for w in (
-            self._scale_widget,
-            self._translate_widget,
-            self._rotate_widget,
-            self._shear_widget,
-            self._affine_widget,
-        ):
+        for w in self._transform_widgets:
             w.setAxes(layer_axes)
 
     # TODO: make this a slot
     def _on_apply_clicked(self, event) -> None:
-        if self._selected_layer is None:
+        source = self._selected_layer
+        if source is None:
             return
+        # Copy any edits that are still waiting to be applied to the source.
+        for w in self._transform_widgets:
+            w.apply_pending()
         similar_layers = (
             layer
             for layer in self._viewer.layers
-            if layer.ndim == self._selected_layer.ndim
+            if layer.ndim == source.ndim and layer is not source
         )
+        # Read the source values once rather than once per target layer.
+        values = {
+            name: getattr(source, name)
+            for name in ("scale", "translate", "rotate", "shear")
+        }
+        affine = source.affine
+        affine_matrix = affine.affine_matrix
+        # Each assignment recomputes the layer's transforms and redraws it,
+        # so only assign the ones that differ.
         for layer in similar_layers:
-            layer.scale = self._selected_layer.scale
-            layer.translate = self._selected_layer.translate
-            layer.rotate = self._selected_layer.rotate
-            layer.shear = self._selected_layer.shear
-            layer.affine = self._selected_layer.affine
+            for name, value in values.items():
+                if not np.array_equal(getattr(layer, name), value):
+                    setattr(layer, name, value)
+            if not np.array_equal(layer.affine.affine_matrix, affine_matrix):
+                layer.affine = affine
 
 
 class NameWidget(QWidget):
@@ -147,192 +199,190 @@ class NameWidget(QWidget):
 
 
 class _Collapsible(QCollapsible):
+    widgetCreated = Signal(object)
+
     def __init__(
-        self, title: str, widget: QWidget, parent: Optional[QWidget] = None
+        self,
+        title: str,
+        factory: Callable[[], QWidget],
+        parent: Optional[QWidget] = None,
     ):
         super().__init__(title, parent)
-        self.addWidget(widget)
+        self._factory = factory
+        self._widget: Optional[QWidget] = None
         layout = self.layout()
         assert layout is not None
         layout.setContentsMargins(0, 0, 0, 0)
 
+    def widget(self) -> Optional[QWidget]:
+        return self._widget
 
-class TranslateWidget(VectorEdit):
-    def __init__(self) -> None:
-        super().__init__()
-        self._layer = None
-        self.arrayChanged.connect(self._on_array_changed)
+    def expand(self, animate: bool = True) -> None:
+        # Create the widget before expanding, so that the expanded height
+        # accounts for it.
+        if self._widget is None:
+            self._widget = self._factory()
+            self.addWidget(self._widget)
+            self.widgetCreated.emit(self._widget)
+        super().expand(animate)
 
-    def set_layer(self, layer: Optional["Layer"]) -> None:
-        if layer is self._layer:
-            return
-        old_layer = self._layer
-        if old_layer is not None:
-            old_layer.events.translate.disconnect(
-                self._on_layer_translate_changed
-            )
-        if layer is not None:
-            self._set_array(layer.affine.translate)
-            layer.events.translate.connect(self._on_layer_translate_changed)
-        self._layer = layer
 
-    def _set_array(self, array: np.ndarray) -> None:
-        self.setArray(array)
+class _LayerTransformEdit:
+    """Mixin that edits one transform of a layer.
 
-    def _on_array_changed(self, array: np.ndarray) -> None:
-        if self._layer is not None:
-            with self._layer.events.translate.blocker(
-                self._on_layer_translate_changed
-            ):
-                self._layer.translate = array
+    Subclasses name the transform with ``_event_name`` and can override
+    ``_layer_array`` if the layer does not store it in the edited form.
+    """
 
-    def _on_layer_translate_changed(self) -> None:
-        self._set_array(self._layer.translate)
+    _event_name: str
+    _layer: Optional["Layer"]
 
-
-class ScaleWidget(VectorEdit):
     def __init__(self) -> None:
         super().__init__()
         self._layer = None
-        self.arrayChanged.connect(self._on_array_changed)
+        # Edits are applied to the layer after a short delay, so that
+        # bursts of changes only cause one layer update.
+        self.delay_ms = 50
+        self._pending: Optional[np.ndarray] = None
+        self._apply_timer = QTimer(self)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.timeout.connect(self.apply_pending)
+        self.arrayChanged.connect(
+            self._on_array_changed, Qt.ConnectionType.DirectConnection
+        )
 
     def set_layer(self, layer: Optional["Layer"]) -> None:
         if layer is self._layer:
             return
-        old_layer = self._layer
-        if old_layer is not None:
-            old_layer.events.scale.disconnect(self._on_layer_scale_changed)
+        self.apply_pending()
+        if self._layer is not None:
+            self._layer_event(self._layer).disconnect(self._on_layer_changed)
         if layer is not None:
-            self._set_array(layer.affine.scale)
-            layer.events.scale.connect(self._on_layer_scale_changed)
+            self._set_array(self._layer_array(layer))
+            self._layer_event(layer).connect(self._on_layer_changed)
         self._layer = layer
 
+    def _layer_event(self, layer: "Layer"):
+        return getattr(layer.events, self._event_name)
+
+    def _layer_array(self, layer: "Layer") -> np.ndarray:
+        return getattr(layer, self._event_name)
+
     def _set_array(self, array: np.ndarray) -> None:
         self.setArray(array)
 
     def _on_array_changed(self, array: np.ndarray) -> None:
+        self._pending = array.copy()
+        self._apply_timer.start(self.delay_ms)
+
+    def apply_pending(self) -> None:
+        """Write any edit that is still waiting to the layer now."""
+        self._apply_timer.stop()
+        array, self._pending = self._pending, None
+        if array is None or self._layer is None:
+            return
+        previous = self._layer_array(self._layer)
+        if np.array_equal(array, previous):
+            return
+        with self._layer_event(self._layer).blocker(self._on_layer_changed):
+            try:
+                setattr(self._layer, self._event_name, array)
+            except ValueError:
+                # Drop an edit that the layer rejects (e.g. a NaN). The
+                # layer may have stored part of it, so restore its value.
+                setattr(self._layer, self._event_name, previous)
+                self._set_array(previous)
+
+    def refresh(self) -> None:
+        """Show the layer's current value, dropping any pending edit."""
+        self._apply_timer.stop()
+        self._pending = None
         if self._layer is not None:
-            with self._layer.events.scale.blocker(
-                self._on_layer_scale_changed
-            ):
-                self._layer.scale = array
+            self._set_array(self._layer_array(self._layer))
 
-    def _on_layer_scale_changed(self) -> None:
-        self._set_array(self._layer.scale)
+    def _on_layer_changed(self) -> None:
+        # The layer's new value supersedes any edit that is still pending.
+        self.refresh()
 
 
-class RotateWidget(MatrixEdit):
-    def __init__(self) -> None:
-        super().__init__()
-        self._layer = None
-        self.arrayChanged.connect(self._on_array_changed)
+class TranslateWidget(_LayerTransformEdit, VectorEdit):
+    _event_name = "translate"
 
-    def set_layer(self, layer: Optional["Layer"]) -> None:
-        if layer is self._layer:
-            return
-        old_layer = self._layer
-        if old_layer is not None:
-            old_layer.events.rotate.disconnect(self._on_layer_rotate_changed)
-        if layer is not None:
-            self._set_array(layer.rotate)
-            layer.events.rotate.connect(self._on_layer_rotate_changed)
-        self._layer = layer
 
-    def _set_array(self, array: np.ndarray) -> None:
-        self.setArray(array)
+class ScaleWidget(_LayerTransformEdit, VectorEdit):
+    _event_name = "scale"
 
-    def _on_array_changed(self, array: np.ndarray) -> None:
-        if self._layer is not None:
-            with self._layer.events.rotate.blocker(
-                self._on_layer_rotate_changed
-            ):
-                self._layer.rotate = array
 
-    def _on_layer_rotate_changed(self) -> None:
-        self._set_array(self._layer.rotate)
+class RotateWidget(_LayerTransformEdit, MatrixEdit):
+    _event_name = "rotate"
 
 
-class ShearWidget(MatrixEdit):
-    def __init__(self) -> None:
-        super().__init__()
-        self._layer = None
-        self.arrayChanged.connect(self._on_array_changed)
+class ShearWidget(_LayerTransformEdit, MatrixEdit):
+    _event_name = "shear"
 
-    def set_layer(self, layer: Optional["Layer"]) -> None:
-        if layer is self._layer:
-            return
-        old_layer = self._layer
-        if old_layer is not None:
-            old_layer.events.shear.disconnect(self._on_layer_shear_changed)
-        if layer is not None:
-            shear = _shear_matrix(layer)
-            self._set_array(shear)
-            layer.events.shear.connect(self._on_layer_shear_changed)
-        self._layer = layer
+    def _layer_array(self, layer: "Layer") -> np.ndarray:
+        # Shear can be the upper triangle values (in a vector)
+        # or the matrix itself. Always make it a matrix.
+        return _shear_matrix(layer)
 
     def _set_array(self, array: np.ndarray) -> None:
-        editable = np.zeros(array.shape, dtype=bool)
-        editable[np.triu_indices(array.shape[0], 1)] = True
+        editable = _shear_editable_mask(array.shape[0])
         self.setArray(array, editable=editable)
 
-    def _on_array_changed(self, array: np.ndarray) -> None:
-        if self._layer is not None:
-            with self._layer.events.shear.blocker(
-                self._on_layer_shear_changed
-            ):
-                self._layer.shear = array
 
-    def _on_layer_shear_changed(self) -> None:
-        # Shear can be the upper triangle values (in a vector)
-        # or the matrix itself. Always make it a matrix.
-        shear = _shear_matrix(self._layer)
-        self._set_array(shear)
+@lru_cache(maxsize=16)
+def _triu_indices(ndim: int) -> Tuple[np.ndarray, np.ndarray]:
+    rows, columns = np.triu_indices(ndim, k=1)
+    rows.flags.writeable = False
+    columns.flags.writeable = False
+    return rows, columns
+
+
+@lru_cache(maxsize=16)
+def _eye(ndim: int) -> np.ndarray:
+    eye = np.eye(ndim)
+    eye.flags.writeable = False
+    return eye
+
+
+@lru_cache(maxsize=16)
+def _shear_editable_mask(ndim: int) -> np.ndarray:
+    # Only the upper triangle of a shear matrix is free.
+    editable = np.zeros((ndim, ndim), dtype=bool)
+    editable[_triu_indices(ndim)] = True
+    editable.flags.writeable = False
+    return editable
 
 
 def _shear_matrix(layer: "Layer") -> np.ndarray:
     shear = layer.shear
     ndim = layer.ndim
     if shear.ndim == 1:
-        shear_matrix = np.eye(ndim)
-        shear_matrix[np.triu_indices(ndim, k=1)] = shear
+        shear_matrix = _eye(ndim).copy()
+        shear_matrix[_triu_indices(ndim)] = shear
         return shear_matrix
     return shear
 
 
-class AffineWidget(MatrixEdit):
-    def __init__(self) -> None:
-        super().__init__()
-        self._layer = None
-        self.arrayChanged.connect(self._on_array_changed)
-
-    def set_layer(self, layer: Optional["Layer"]) -> None:
-        if layer is self._layer:
-            return
-        old_layer = self._layer
-        if old_layer is not None:
-            old_layer.events.affine.disconnect(self._on_layer_affine_changed)
-        if layer is not None:
-            self._set_array(layer.affine.affine_matrix)
-            layer.events.affine.connect(self._on_layer_affine_changed)
-        self._layer = layer
+class AffineWidget(_LayerTransformEdit, MatrixEdit):
+    _event_name = "affine"
 
     def setAxes(self, axes: Tuple[str, ...]) -> None:
         # For homogeneous coordinate.
         super().setAxes(axes + ("",))
 
+    def _layer_array(self, layer: "Layer") -> np.ndarray:
+        return layer.affine.affine_matrix
+
     def _set_array(self, array: np.ndarray) -> None:
-        editable = np.ones(array.shape, dtype=bool)
-        editable[-1, :] = False
+        editable = _affine_editable_mask(array.shape)
         self.setArray(array, editable=editable)
 
-    def _on_array_changed(self, array: np.ndarray) -> None:
-        if self._layer is not None:
-            with self._layer.events.affine.blocker(
-                self._on_layer_affine_changed
-            ):
-                self._layer.affine = array
-
-    def _on_layer_affine_changed(self) -> None:
-        axes = self.getAxes()
-        self._set_array(self._layer.affine.affine_matrix)
-        super().setAxes(axes)
+
+@lru_cache(maxsize=16)
+def _affine_editable_mask(shape: Tuple[int, ...]) -> np.ndarray:
+    # The last row of an affine matrix is fixed by homogeneous coordinates.
+    editable = np.ones(shape, dtype=bool)
+    editable[-1, :] = False
+    editable.flags.writeable = False
+    return editable
@@ -1,25 +1,193 @@
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import Any, Optional, Tuple
 
 import numpy as np
-from qtpy.QtCore import Qt, Signal
+from qtpy.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QObject,
+    Qt,
+    QTimer,
+    Signal,
+)
 from qtpy.QtWidgets import (
     QAbstractScrollArea,
     QSizePolicy,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QWidget,
 )
 
+_DISPLAY_FORMAT = "%.7g"
+_READ_ONLY_FLAGS = (
+    Qt.ItemFlag.ItemIsSelectable
+    | Qt.ItemFlag.ItemIsEnabled
+    | Qt.ItemFlag.ItemNeverHasChildren
+)
+_EDITABLE_FLAGS = _READ_ONLY_FLAGS | Qt.ItemFlag.ItemIsEditable
+
+
+@lru_cache(maxsize=16)
+def _all_editable_mask(shape: Tuple[int, ...]) -> np.ndarray:
+    editable = np.ones(shape, dtype=bool)
+    editable.flags.writeable = False
+    return editable
+
+
+def _format(array: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Format all values in one vectorized call instead of one per cell.
+    texts = np.char.mod(_DISPLAY_FORMAT, array)
+    lengths = np.char.str_len(texts).max(axis=0, initial=0)
+    return texts.astype(object), lengths
+
+
+class _ArrayModel(QAbstractTableModel):
+    """Table model that owns a 2D array and edits it in place."""
+
+    cellEdited = Signal(int, int)
+    _array: np.ndarray
+    _editable: np.ndarray
+    _texts: np.ndarray
+    _text_lengths: np.ndarray
+    _row_labels: Tuple[str, ...]
+    _column_labels: Tuple[str, ...]
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._array = np.zeros((0, 0), dtype=float)
+        self._editable = np.ones((0, 0), dtype=bool)
+        self._texts = np.empty((0, 0), dtype=object)
+        self._text_lengths = np.zeros((0,), dtype=int)
+        self._row_labels = ()
+        self._column_labels = ()
+
+    def array(self) -> np.ndarray:
+        return self._array
+
+    def editable(self) -> np.ndarray:
+        return self._editable
+
+    def setArray(self, array: np.ndarray, editable: np.ndarray) -> bool:
+        """Returns True if the longest text in any column changed length."""
+        texts, text_lengths = _format(array)
+        lengths_changed = not np.array_equal(text_lengths, self._text_lengths)
+        self._text_lengths = text_lengths
+        if array.shape != self._array.shape:
+            self.beginResetModel()
+            self._array = np.array(array, dtype=np.float64)
+            self._editable = np.array(editable, dtype=bool)
+            self._texts = texts
+            self.endResetModel()
+            return lengths_changed
+        changed = (array != self._array) | (editable != self._editable)
+        # Reuse the existing buffers when the shape is unchanged.
+        np.copyto(self._array, array)
+        np.copyto(self._editable, editable)
+        self._texts = texts
+        if changed.any():
+            rows, columns = np.nonzero(changed)
+            self.dataChanged.emit(
+                self.index(int(rows.min()), int(columns.min())),
+                self.index(int(rows.max()), int(columns.max())),
+            )
+        return lengths_changed
+
+    def setHeaderLabels(
+        self, orientation: Qt.Orientation, labels: Tuple[str, ...]
+    ) -> None:
+        if orientation == Qt.Orientation.Horizontal:
+            self._column_labels = labels
+        else:
+            self._row_labels = labels
+        if len(labels) > 0:
+            self.headerDataChanged.emit(orientation, 0, len(labels) - 1)
+
+    def rowCount(self, parent: Optional[QModelIndex] = None) -> int:
+        # Only the invisible root has children in a table model.
+        if parent is not None and parent.isValid():
+            return 0
+        return self._array.shape[0]
 
-class VectorEdit(QTableWidget):
+    def columnCount(self, parent: Optional[QModelIndex] = None) -> int:
+        if parent is not None and parent.isValid():
+            return 0
+        return self._array.shape[1]
+
+    def data(
+        self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole
+    ) -> Any:
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._texts[index.row(), index.column()]
+        if role == Qt.ItemDataRole.EditRole:
+            # Edit the full precision value rather than the displayed one.
+            return str(self._array[index.row(), index.column()])
+        return None
+
+    def setData(
+        self,
+        index: QModelIndex,
+        value: Any,
+        role: int = Qt.ItemDataRole.EditRole,
+    ) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return False
+        row, column = index.row(), index.column()
+        if value == self._array[row, column]:
+            return True
+        self._array[row, column] = value
+        self._texts[row, column] = _DISPLAY_FORMAT % value
+        self._text_lengths[column] = max(map(len, self._texts[:, column]))
+        self.dataChanged.emit(index, index)
+        self.cellEdited.emit(row, column)
+        return True
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if self._editable[index.row(), index.column()]:
+            return _EDITABLE_FLAGS
+        return _READ_ONLY_FLAGS
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        labels = (
+            self._column_labels
+            if orientation == Qt.Orientation.Horizontal
+            else self._row_labels
+        )
+        if role == Qt.ItemDataRole.DisplayRole and section < len(labels):
+            return labels[section]
+        return super().headerData(section, orientation, role)
+
+
+class VectorEdit(QTableView):
     arrayChanged = Signal(object)
     _array: np.ndarray
+    _editable: np.ndarray
     _axes: Tuple[str, ...]
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
         self._array = np.zeros((0,), dtype=float)
-        self.cellChanged.connect(self._onCellChanged)
+        self._editable = np.ones((0,), dtype=bool)
+        self._axes = ()
+        self._model = _ArrayModel(self)
+        self._model.cellEdited.connect(self._onCellEdited)
+        self.setModel(self._model)
+        # Measuring the cells is slow, so do it once per burst of changes.
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(0)
+        self._resize_timer.timeout.connect(self._doResize)
         self.verticalHeader().setVisible(False)
         # Based on answer at:
         # https://stackoverflow.com/questions/75025334/remove-empty-space-at-bottom-of-qtablewidget
@@ -38,49 +206,65 @@ class VectorEdit(QTableWidget):
     ) -> None:
         assert array.ndim == 1
         if editable is None:
-            editable = np.ones(array.shape, dtype=bool)
+            editable = _all_editable_mask(array.shape)
         assert editable.shape == array.shape
-        self._array = np.array(array, dtype=float, copy=True)
-
-        self.clear()
-        self.setRowCount(1)
-        self.setColumnCount(array.shape[0])
-        for c in range(self.columnCount()):
-            item = QTableWidgetItem(str(array[c]))
-            self.setItem(0, c, item)
-            flags = item.flags()
-            if not editable[c]:
-                flags &= ~Qt.ItemFlag.ItemIsEditable
-            item.setFlags(flags)
-        self.resizeColumnsToContents()
-        self.resizeRowsToContents()
+        # Layers often re-emit unchanged values, so avoid touching the
+        # table in that case.
+        if np.array_equal(array, self._array) and np.array_equal(
+            editable, self._editable
+        ):
+            return
+        shape_changed = array.shape != self._array.shape
+        lengths_changed = self._model.setArray(
+            array.reshape(1, -1), editable.reshape(1, -1)
+        )
+        # The model owns the values, so keep views of its single row.
+        self._array = self._model.array()[0]
+        self._editable = self._model.editable()[0]
+        # Only measure the cells again when their size may have changed.
+        if shape_changed or lengths_changed:
+            self._resize_timer.start()
 
     def getAxes(self) -> Tuple[str, ...]:
         return self._axes
 
     def setAxes(self, axes: Tuple[str, ...]) -> None:
         assert len(axes) == len(self._array)
+        if axes == self._axes:
+            return
         self._axes = axes
-        self.setHorizontalHeaderLabels(axes)
+        self._model.setHeaderLabels(Qt.Orientation.Horizontal, axes)
 
-    def _onCellChanged(self, row: int, column: int) -> None:
-        assert row == 0
-        if item := self.item(0, column):
-            data = item.data(Qt.ItemDataRole.DisplayRole)
-            value = float(data)
-            self._array[column] = value
-            self.arrayChanged.emit(self._array)
+    def _onCellEdited(self, row: int, column: int) -> None:
+        # The model has already recorded the edited text's length, so a
+        # later setArray will not see it as a change.
+        self._resize_timer.start()
+        self.arrayChanged.emit(self._array)
+
+    def _doResize(self) -> None:
+        self.resizeColumnsToContents()
+        self.resizeRowsToContents()
 
 
-class MatrixEdit(QTableWidget):
+class MatrixEdit(QTableView):
     arrayChanged = Signal(object)
     _array: np.ndarray
+    _editable: np.ndarray
     _axes: Tuple[str, ...]
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
         self._array = np.zeros((0, 0), dtype=float)
-        self.cellChanged.connect(self._onCellChanged)
+        self._editable = np.ones((0, 0), dtype=bool)
+        self._axes = ()
+        self._model = _ArrayModel(self)
+        self._model.cellEdited.connect(self._onCellEdited)
+        self.setModel(self._model)
+        # Measuring the cells is slow, so do it once per burst of changes.
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(0)
+        self._resize_timer.timeout.connect(self._doResize)
         self.setSizeAdjustPolicy(
             QAbstractScrollArea.SizeAdjustPolicy.AdjustToContents
         )
@@ -96,36 +280,39 @@ class MatrixEdit(QTableWidget):
     ) -> None:
         assert array.ndim == 2
         if editable is None:
-            editable = np.ones(array.shape, dtype=bool)
+            editable = _all_editable_mask(array.shape)
         assert editable.shape == array.shape
-        self._array = np.array(array, dtype=float, copy=True)
-
-        self.clear()
-        self.setRowCount(array.shape[0])
-        self.setColumnCount(array.shape[1])
-        for r in range(self.rowCount()):
-            for c in range(self.columnCount()):
-                item = QTableWidgetItem(str(array[r, c]))
-                self.setItem(r, c, item)
-                flags = item.flags()
-                if not editable[r, c]:
-                    flags &= ~Qt.ItemFlag.ItemIsEditable
-                item.setFlags(flags)
-        self.resizeColumnsToContents()
-        self.resizeRowsToContents()
+        # Layers often re-emit unchanged values, so avoid touching the
+        # table in that case.
+        if np.array_equal(array, self._array) and np.array_equal(
+            editable, self._editable
+        ):
+            return
+        shape_changed = array.shape != self._array.shape
+        lengths_changed = self._model.setArray(array, editable)
+        self._array = self._model.array()
+        self._editable = self._model.editable()
+        # Only measure the cells again when their size may have changed.
+        if shape_changed or lengths_changed:
+            self._resize_timer.start()
 
     def getAxes(self) -> Tuple[str, ...]:
         return self._axes
 
     def setAxes(self, axes: Tuple[str, ...]) -> None:
         assert len(axes) == self._array.shape[0] == self._array.shape[1]
+        if axes == self._axes:
+            return
         self._axes = axes
-        self.setHorizontalHeaderLabels(axes)
-        self.setVerticalHeaderLabels(axes)
-
-    def _onCellChanged(self, row: int, column: int) -> None:
-        if item := self.item(row, column):
-            data = item.data(Qt.ItemDataRole.DisplayRole)
-            value = float(data)
-            self._array[row, column] = value
-            self.arrayChanged.emit(self._array)
+        self._model.setHeaderLabels(Qt.Orientation.Horizontal, axes)
+        self._model.setHeaderLabels(Qt.Orientation.Vertical, axes)
+
+    def _onCellEdited(self, row: int, column: int) -> None:
+        # The model has already recorded the edited text's length, so a
+        # later setArray will not see it as a change.
+        self._resize_timer.start()
+        self.arrayChanged.emit(self._array)
+
+    def _doResize(self) -> None:
+        self.resizeColumnsToContents()
+        self.resizeRowsToContents()
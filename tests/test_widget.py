@@ -1,10 +1,230 @@
+import numpy as np
 from napari.components import ViewerModel
-from napari_transforms._widget import TransformsWidget
 from pytestqt.qtbot import QtBot
 
+from napari_transforms._widget import TransformsWidget
+
 
 def test_transforms_widget(qtbot: QtBot):
     viewer = ViewerModel()
     widget = TransformsWidget(viewer)
     qtbot.addWidget(widget)
     assert widget is not None
+
+
+def test_scale_edit_applied_to_layer(qtbot: QtBot):
+    viewer = ViewerModel()
+    layer = viewer.add_image(np.zeros((4, 5)))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+
+    model = widget._scale.widget().model()
+    model.setData(model.index(0, 1), "2")
+
+    qtbot.waitUntil(lambda: tuple(layer.scale) == (1, 2))
+
+
+def test_initial_scale_and_translate_shown(qtbot: QtBot):
+    viewer = ViewerModel()
+    viewer.add_image(np.zeros((4, 5)), scale=(2, 3), translate=(4, 5))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+
+    np.testing.assert_array_equal(widget._scale.widget().getArray(), (2, 3))
+    np.testing.assert_array_equal(
+        widget._translate.widget().getArray(), (4, 5)
+    )
+
+
+def test_layer_change_cancels_pending_edit(qtbot: QtBot):
+    viewer = ViewerModel()
+    layer = viewer.add_image(np.zeros((4, 5)))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+    scale_widget = widget._scale.widget()
+
+    model = scale_widget.model()
+    model.setData(model.index(0, 1), "2")
+    layer.scale = (5, 5)
+    qtbot.wait(2 * scale_widget.delay_ms)
+
+    np.testing.assert_array_equal(layer.scale, (5, 5))
+    np.testing.assert_array_equal(scale_widget.getArray(), (5, 5))
+
+
+def test_layer_scale_change_not_echoed(qtbot: QtBot):
+    viewer = ViewerModel()
+    layer = viewer.add_image(np.zeros((4, 5)))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+    events = []
+    layer.events.scale.connect(events.append)
+
+    layer.scale = (2, 3)
+    qtbot.wait(500)
+
+    assert len(events) == 1
+    np.testing.assert_array_equal(widget._scale.widget().getArray(), (2, 3))
+
+
+def test_rejected_edit_dropped_on_layer_change(qtbot: QtBot):
+    viewer = ViewerModel()
+    layer_a = viewer.add_image(np.zeros((4, 5)))
+    layer_b = viewer.add_image(np.zeros((6, 7)))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+    viewer.layers.selection.active = layer_a
+
+    model = widget._scale.widget().model()
+    model.setData(model.index(0, 1), "nan")
+    viewer.layers.selection.active = layer_b
+
+    assert widget._selected_layer is layer_b
+    assert all(w._layer is layer_b for w in widget._transform_widgets)
+    np.testing.assert_array_equal(layer_a.scale, (1, 1))
+
+
+def test_select_layers_with_different_ndim(qtbot: QtBot):
+    viewer = ViewerModel()
+    layer_2d = viewer.add_image(np.zeros((4, 5)))
+    layer_3d = viewer.add_image(np.zeros((3, 4, 5)))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+
+    widget._affine.expand(animate=False)
+    viewer.layers.selection.active = layer_2d
+
+    assert widget._scale.widget().getArray().shape == (2,)
+    assert widget._affine.widget().getArray().shape == (3, 3)
+    assert len(widget._affine.widget().getAxes()) == 3
+
+    viewer.layers.selection.active = layer_3d
+
+    assert widget._scale.widget().getArray().shape == (3,)
+    assert widget._affine.widget().getArray().shape == (4, 4)
+    assert len(widget._affine.widget().getAxes()) == 4
+
+
+def test_layer_ndim_changed(qtbot: QtBot):
+    viewer = ViewerModel()
+    layer = viewer.add_image(np.zeros((4, 5)))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+    widget._affine.expand(animate=False)
+
+    layer.data = np.zeros((3, 4, 5))
+    qtbot.waitUntil(lambda: not widget._axis_labels_timer.isActive())
+
+    assert widget._scale.widget().getArray().shape == (3,)
+    assert widget._affine.widget().getArray().shape == (4, 4)
+    assert len(widget._scale.widget().getAxes()) == 3
+    assert len(widget._affine.widget().getAxes()) == 4
+
+
+def test_axis_labels_changed(qtbot: QtBot):
+    viewer = ViewerModel()
+    viewer.add_image(np.zeros((4, 5)))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+
+    widget._affine.expand(animate=False)
+    viewer.dims.axis_labels = ("y", "x")
+    viewer.dims.axis_labels = ("row", "column")
+
+    qtbot.waitUntil(
+        lambda: widget._scale.widget().getAxes() == ("row", "column")
+    )
+    assert widget._affine.widget().getAxes() == ("row", "column", "")
+
+
+def test_shear_edit_applied_to_layer(qtbot: QtBot):
+    viewer = ViewerModel()
+    layer = viewer.add_image(np.zeros((3, 4, 5)))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+    widget._shear.expand(animate=False)
+    widget._shear.widget().delay_ms = 0
+
+    model = widget._shear.widget().model()
+    model.setData(model.index(0, 2), "0.5")
+
+    qtbot.waitUntil(lambda: layer.shear[1] == 0.5)
+    np.testing.assert_array_equal(layer.shear, (0, 0.5, 0))
+
+
+def test_apply_to_similar_layers(qtbot: QtBot):
+    viewer = ViewerModel()
+    source = viewer.add_image(np.zeros((4, 5)), scale=(2, 3))
+    similar = viewer.add_image(np.zeros((6, 7)))
+    other = viewer.add_image(np.zeros((3, 4, 5)))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+    viewer.layers.selection.active = source
+
+    widget._name_widget.apply_all_layers.click()
+
+    np.testing.assert_array_equal(similar.scale, (2, 3))
+    np.testing.assert_array_equal(other.scale, (1, 1, 1))
+
+
+def test_apply_to_similar_layers_includes_pending_edit(qtbot: QtBot):
+    viewer = ViewerModel()
+    source = viewer.add_image(np.zeros((4, 5)))
+    similar = viewer.add_image(np.zeros((6, 7)))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+    viewer.layers.selection.active = source
+
+    model = widget._scale.widget().model()
+    model.setData(model.index(0, 1), "3")
+    widget._name_widget.apply_all_layers.click()
+
+    np.testing.assert_array_equal(source.scale, (1, 3))
+    np.testing.assert_array_equal(similar.scale, (1, 3))
+
+
+def test_transform_widget_created_on_expand(qtbot: QtBot):
+    viewer = ViewerModel()
+    viewer.add_image(np.zeros((3, 4, 5)), rotate=90)
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+    assert widget._rotate.widget() is None
+
+    widget._rotate.expand(animate=False)
+
+    rotate_widget = widget._rotate.widget()
+    np.testing.assert_allclose(
+        rotate_widget.getArray(), viewer.layers[0].rotate
+    )
+    assert rotate_widget.getAxes() == viewer.dims.axis_labels
+
+
+def test_columns_resized_after_layer_change(qtbot: QtBot):
+    viewer = ViewerModel()
+    layer = viewer.add_image(np.zeros((4, 5)))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+    translate = widget._translate.widget()
+
+    layer.translate = (123456.789, 0)
+
+    qtbot.waitUntil(
+        lambda: translate.columnWidth(0) > translate.columnWidth(1)
+    )
+
+
+def test_columns_resized_after_edit_and_layer_change(qtbot: QtBot):
+    viewer = ViewerModel()
+    layer = viewer.add_image(np.zeros((4, 5)))
+    widget = TransformsWidget(viewer)
+    qtbot.addWidget(widget)
+    translate = widget._translate.widget()
+    qtbot.waitUntil(lambda: not translate._resize_timer.isActive())
+
+    model = translate.model()
+    model.setData(model.index(0, 0), "123456.7")
+    layer.translate = (654321.9, 0)
+
+    qtbot.waitUntil(
+        lambda: translate.columnWidth(0) >= translate.sizeHintForColumn(0)
+    )